@@ -1,6 +1,8 @@
 from .compatibility import ast
 from .errors import XunSyntaxError
 from pathlib import Path
+import copy
+import hashlib
 import importlib
 import inspect
 import networkx as nx
@@ -105,6 +107,33 @@ def draw_list(plt, G, root):
     plt.show()
 
 
+# Hierarchical layouts scale poorly, graphs with more nodes than this are drawn
+# using a layout that scales to large graphs.
+LARGE_GRAPH_NODE_COUNT = 200
+
+
+def large_graph_layout(G):
+    """Large graph layout
+
+    Compute node positions for a large graph using the multiscale graphviz
+    `sfdp` layout. If pygraphviz is not available, a spectral layout is used.
+
+    Parameters
+    ----------
+    G : nx.DiGraph
+        The graph to lay out
+
+    Returns
+    -------
+    dict
+        Mapping of node to position
+    """
+    try:
+        return nx.drawing.nx_agraph.graphviz_layout(G, prog='sfdp')
+    except ImportError:
+        return nx.spectral_layout(G)
+
+
 def draw_dot(plt, G, root):
     cmap = plt.get_cmap('viridis')
     colors = cmap(np.linspace(0, 1, len(G.nodes())))
@@ -119,11 +148,14 @@ def draw_dot(plt, G, root):
     ax.set_title(root)
     ax.axis("off")
 
-    graphviz_args = '-Groot="{}"'.format(repr(root))
-    pos = nx.drawing.nx_agraph.graphviz_layout(
-        G, prog='dot', root=None, args=graphviz_args
-    )
-    pos = {node: (y, x) for node, (x, y) in pos.items()}
+    if G.number_of_nodes() > LARGE_GRAPH_NODE_COUNT:
+        pos = large_graph_layout(G)
+    else:
+        graphviz_args = '-Groot="{}"'.format(repr(root))
+        pos = nx.drawing.nx_agraph.graphviz_layout(
+            G, prog='dot', root=None, args=graphviz_args
+        )
+        pos = {node: (y, x) for node, (x, y) in pos.items()}
     nx.draw_networkx(
         G,
         pos=pos,
@@ -136,10 +168,17 @@ def draw_dot(plt, G, root):
     plt.show()
 
 
+_loaded_scripts = {}
+
+
 def load_module(path):
     """Load Module
 
-    Load and return module
+    Load and return module. Loaded modules are kept by path along with a hash
+    of the script, so loading the same script again returns the already
+    executed module, unless the contents of the file have changed since. The
+    modules are not registered in ``sys.modules``, so that objects defined in
+    scripts are still pickled by value.
 
     Parameters
     ----------
@@ -152,9 +191,23 @@ def load_module(path):
         The loaded module
     """
     path = Path(path).resolve()
+    source = path.read_bytes()
+    digest = hashlib.sha256(source).digest()
+
+    try:
+        loaded_digest, module = _loaded_scripts[path]
+    except KeyError:
+        pass
+    else:
+        if loaded_digest == digest:
+            return module
+
+    # The source that was hashed is executed directly. Cached bytecode is
+    # validated by modification time and size, which an edit can leave as is
     spec = importlib.util.spec_from_file_location('_xun_script_module', path)
     module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    exec(compile(source, str(path), 'exec'), module.__dict__)
+    _loaded_scripts[path] = digest, module
     return module
 
 
@@ -181,6 +234,74 @@ def identify_function(function_name, module):
     return found[0][1]
 
 
+# Only the argument expressions differ between interpreted calls, so the
+# statements evaluating them are parsed once and patched for every call.
+_CALL_ARGUMENTS_TEMPLATE = ast.parse('args = []\nkwargs = {}')
+
+
+def call_arguments_module(call):
+    """Call arguments module
+
+    Create a module that evaluates the arguments of a call, assigning them to
+    `args` and `kwargs`. The module is a copy of a prebuilt template, so that
+    only the argument expressions have to be filled in.
+
+    Parameters
+    ----------
+    call : ast.Call
+        The call whose arguments should be evaluated
+
+    Returns
+    -------
+    ast.Module
+        Module ready to be compiled
+    """
+    assign_args, assign_kwargs = (
+        copy.copy(stmt) for stmt in _CALL_ARGUMENTS_TEMPLATE.body
+    )
+
+    assign_args.value = copy.copy(assign_args.value)
+    assign_args.value.elts = call.args
+
+    assign_kwargs.value = copy.copy(assign_kwargs.value)
+    assign_kwargs.value.keys = [
+        ast.Constant(value=kw.arg, kind=None) for kw in call.keywords
+    ]
+    assign_kwargs.value.values = [kw.value for kw in call.keywords]
+
+    return ast.fix_missing_locations(ast.Module(
+        type_ignores=[],
+        body=[assign_args, assign_kwargs],
+    ))
+
+
+def call_string_error(call_string):
+    """Call string error
+
+    Diagnose a call string that could not be parsed as an expression
+
+    Parameters
+    ----------
+    call_string : str
+        The call string in python syntax
+
+    Returns
+    -------
+    XunSyntaxError
+        Error describing why the call string is not a single expression
+
+    Raises
+    ------
+    SyntaxError
+        If the call string is not valid python
+    """
+    tree = ast.parse(call_string)
+    if len(tree.body) != 1:
+        msg = 'There must be exactly one statement in call string'
+        return XunSyntaxError(msg)
+    return XunSyntaxError('Call string must be a single expression')
+
+
 def interpret_call(call_string, module):
     """Interpret call
 
@@ -206,64 +327,25 @@ def interpret_call(call_string, module):
     CallNode<some_function(1, 2, kw=3)>
 
     """
-    tree = ast.parse(call_string)
-    if len(tree.body) != 1:
-        msg = 'There must be exactly one statement in call string'
-        raise XunSyntaxError(msg)
-
-    expr = tree.body[0]
-    if not isinstance(expr, ast.Expr):
-        raise XunSyntaxError('Call string must be a single expression')
-
-    call = expr.value
+    try:
+        call = ast.parse(call_string, mode='eval').body
+    except SyntaxError:
+        raise call_string_error(call_string) from None
     if not isinstance(call, ast.Call):
         raise XunSyntaxError('Call string is not a call')
     if not isinstance(call.func, ast.Name):
         raise XunSyntaxError('Call must be to a named function')
 
-    keywords = {
-        ast.Constant(value=kw.arg, kind=None): kw.value for kw in call.keywords
-    }
-
     function = identify_function(call.func.id, module)
 
-    module = ast.fix_missing_locations(ast.Module(
-        type_ignores=[],
-        body=[
-            ast.Assign(
-                targets=[ast.Name(id='function_name', ctx=ast.Store())],
-                value=ast.Constant(value=function.name, kind=None),
-                type_comment=None,
-            ),
-            ast.Assign(
-                targets=[ast.Name(id='function_hash', ctx=ast.Store())],
-                value=ast.Constant(value=function.hash, kind=None),
-                type_comment=None,
-            ),
-            ast.Assign(
-                targets=[ast.Name(id='args', ctx=ast.Store())],
-                value=ast.List(elts=call.args, ctx=ast.Load()),
-                type_comment=None,
-            ),
-            ast.Assign(
-                targets=[ast.Name(id='kwargs', ctx=ast.Store())],
-                value=ast.Dict(
-                    keys=list(keywords.keys()),
-                    values=list(keywords.values()),
-                ),
-                type_comment=None,
-            ),
-        ],
-    ))
-
-    code = compile(module, '<ast>', 'exec')
+    code = compile(call_arguments_module(call), '<ast>', 'exec')
 
     scope = {}
     exec(code, scope)  # nosec
 
     return xun.functions.CallNode(
-        scope['function_name'],
-        scope['function_hash'],
+        function.name,
+        function.hash,
         *scope['args'],
         **scope['kwargs'],
     )
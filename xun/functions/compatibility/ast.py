@@ -268,6 +268,10 @@ try:
 except ImportError:
     type_ignore = TypeIgnore
 from ast import unaryop
+try:
+    from ast import unparse
+except ImportError:
+    from astor import to_source as unparse
 from ast import walk
 from ast import withitem
 
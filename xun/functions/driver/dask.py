@@ -1,9 +1,9 @@
-from .. import graph as graph_helpers
 from ..errors import ComputeError
 from .driver import Driver
+from dask.base import tokenize
+import array
 import asyncio
 import contextlib
-import functools
 import logging
 import networkx as nx
 
@@ -26,21 +26,20 @@ class Dask(Driver):
               store,
               global_resources):
         assert nx.is_directed_acyclic_graph(graph)
+        pending = self.pending_graph(graph, entry_call, store)
         scheduler = DaskSchedule(self.client,
+                                 pending,
                                  function_images,
                                  store,
                                  global_resources)
-        return scheduler(entry_call, graph)
+        return scheduler(entry_call)
 
 
-def compute_proxy(store, func):
-    """Dask 'handles' functools.partial so that we can't use it. Create a new
-       function instead."""
-    def λ(node):
-        Driver.compute_and_store(node, func, store)
-        return node
-    functools.update_wrapper(λ, func)
-    return λ
+def _run(node, func, store):
+    """Compute a call on a worker. The function and store are scattered to the
+    workers once per run, and passed in by reference."""
+    Driver.compute_and_store(node, func, store)
+    return node
 
 
 class DaskSchedule:
@@ -48,11 +47,16 @@ class DaskSchedule:
     Traverse the call graph and submit jobs using an async implementation of
     Kahn's algorithm [1].
 
+    The schedule only reads plain successor tuples and dependency counters
+    built from the graph on construction, so the graph itself is neither copied
+    nor mutated. A schedule is meant to be run once.
+
     .. [1] https://en.wikipedia.org/wiki/Topological_sorting#Kahn's_algorithm
     """
 
     def __init__(self,
                  client,
+                 graph,
                  function_images,
                  store,
                  global_resources):
@@ -61,109 +65,221 @@ class DaskSchedule:
         self.store = store
         self.errored = False
         self.futures = {}
+        self.batches = {}
         self.semaphores = {
             resource_name: asyncio.BoundedSemaphore(available)
             for resource_name, available in global_resources.items()
         }
 
-    def __call__(self, entry_call, graph):
+        # Per function submission arguments and global resource requests, so
+        # that they are not rebuilt for every call
+        self.submit_kwargs = {}
+        self.resource_requests = {}
+        for name, func_img in function_images.items():
+            kwargs = {}
+            for res, value in func_img['worker_resources'].items():
+                kwargs.setdefault('resources', {})[res] = value
+            self.submit_kwargs[name] = kwargs
+            self.resource_requests[name] = tuple(
+                res
+                for res, req in func_img['global_resources'].items()
+                for _ in range(req)
+            )
+
+        # Futures of the function callables and the store, scattered once at
+        # the start of the run
+        self.scattered_functions = {}
+        self.scattered_store = None
+
+        # Calls to interfaces are computed by their targets, possibly while
+        # the schedule is running, so these are checked again once ready
+        self.interface_hashes = Driver.interface_hashes(function_images)
+
+        # Nodes are referred to by their index in self.nodes while scheduling,
+        # so that the bookkeeping never has to hash call nodes. The event loop
+        # runs visits one at a time between awaits, so it needs no locking.
+        self.nodes = list(graph)
+        index = {node: i for i, node in enumerate(self.nodes)}
+
+        # Successors in compressed sparse row form, the successors of node i
+        # are successor_ids[successor_offsets[i]:successor_offsets[i + 1]]
+        self.successor_offsets = array.array('l', [0])
+        self.successor_ids = array.array('l')
+        for node in self.nodes:
+            self.successor_ids.extend(index[s] for s in graph.successors(node))
+            self.successor_offsets.append(len(self.successor_ids))
+
+        # Number of uncompleted dependencies of each node, a node is ready to
+        # run once this reaches zero. Descendants of failed nodes never reach
+        # zero, and are therefore never submitted.
+        self.remaining = array.array(
+            'l', (graph.in_degree(node) for node in self.nodes))
+        self.source_nodes = [
+            i for i, count in enumerate(self.remaining) if count == 0
+        ]
+        self.cancelled = bytearray(len(self.nodes))
+
+    def __call__(self, entry_call):
         try:
             # Run async regardless of client state
             # https://distributed.dask.org/en/latest/asynchronous.html
-            self.client.sync(self.run, graph)
+            self.client.sync(self.run)
         except KeyboardInterrupt:
             for node, future in self.futures.items():
-                logger.debug(f'{node} cancelled due to keyboard interrupt')
+                logger.debug('%s cancelled due to keyboard interrupt', node)
                 future.cancel(force=True)
             raise
         if not self.errored:
             return self.store.load_callnode(entry_call)
         raise ComputeError('One or more jobs failed')
 
-    async def run(self, graph):
-        atomic_graph = GraphLock(graph)
+    async def run(self):
+        await self.scatter()
+
         queue = asyncio.Queue()
 
-        consumer = asyncio.ensure_future(self.consume_tasks(atomic_graph,
-                                                            queue))
+        consumer = asyncio.ensure_future(self.consume_tasks(queue))
 
-        async with atomic_graph as G:
-            source_nodes = graph_helpers.source_nodes(G)
-        for node in source_nodes:
-            logger.debug(f'Enqueuing {node}')
-            queue.put_nowait(node)
+        for i in self.source_nodes:
+            logger.debug('Enqueuing %s', self.nodes[i])
+            queue.put_nowait(i)
         await queue.join()
 
         consumer.cancel()
 
-    async def consume_tasks(self, atomic_graph, queue):
+    async def consume_tasks(self, queue):
+        # The event loop only keeps weak references to tasks, keep the pending
+        # visits alive until they are done
+        visits = set()
         while True:
-            node = await queue.get()
-            asyncio.ensure_future(self.visit(node, atomic_graph, queue))
+            i = await queue.get()
+            visit = asyncio.ensure_future(self.visit(i, queue))
+            visits.add(visit)
+            visit.add_done_callback(visits.discard)
 
-    async def visit(self, node, atomic_graph, queue):
+    async def visit(self, i, queue):
+        node = self.nodes[i]
         try:
-            if Driver.value_computed(node, self.store):
-                logger.info(f'{node} already completed')
+            if (node.function_hash in self.interface_hashes
+                    and Driver.value_computed(node, self.store)):
+                logger.info('%s already completed', node)
             else:
-                async with contextlib.AsyncExitStack() as stack:
-                    func_img = self.function_images[node.function_name]
-
-                    semaphores = [
-                        stack.enter_async_context(self.semaphores[res])
-                        for res, req in func_img['global_resources'].items()
-                        for _ in range(req)
-                    ]
-                    if semaphores:
-                        logger.info(f'Acquiring resources for {node}')
-                        await asyncio.gather(*semaphores)
-
-                    logger.info(f'Submitting {node}')
-                    func = compute_proxy(self.store, func_img['callable'])
-                    kwargs = {}
-                    for res, value in (func_img['worker_resources'].items()):
-                        kwargs.setdefault('resources', {})[res] = value
-                    future = self.client.submit(func, node, **kwargs)
-                    self.futures[node] = future
-                    await self.client.gather(future, asynchronous=True)
+                await self.run_call(node)
         except Exception as e:
             self.errored = True
-            logger.error(f'{node} failed with {str(e)}')
-            await self.cancel_descendants(atomic_graph, node)
+            logger.error('%s failed with %s', node, e)
+            self.cancel_descendants(i)
         else:
-            logger.info(f'{node} succeeded')
-            async with atomic_graph as G:
-                successors = list(G.successors(node))
-                G.remove_node(node)
-                for s in successors:
-                    if G.in_degree(s) == 0:
-                        logger.debug(f'Enqueuing {s}, successor of {node}')
-                        queue.put_nowait(s)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            for s in self.successors(i):
+                self.remaining[s] -= 1
+                if self.remaining[s] == 0:
+                    if debug:
+                        logger.debug('Enqueuing %s, successor of %s',
+                                     self.nodes[s], node)
+                    queue.put_nowait(s)
         finally:
+            # Only unfinished futures are kept, so that dask can release the
+            # results of finished tasks
+            self.futures.pop(node, None)
+
             # Notify the task queue that a task has been completed. There is a
             # coroutine waiting for the queue to complete, so this is _very_
             # important
             queue.task_done()
 
-    async def cancel_descendants(self, atomic_graph, node):
-        async with atomic_graph as G:
-            descendants = nx.algorithms.dag.descendants(G, node)
-            G.remove_node(node)
-            for descendant in descendants:
-                G.remove_node(descendant)
-                logger.info(
-                    f'{descendant} cancelled due to failed dependency')
+    async def run_call(self, node):
+        async with contextlib.AsyncExitStack() as stack:
+            semaphores = [
+                stack.enter_async_context(self.semaphores[res])
+                for res in self.resource_requests[node.function_name]
+            ]
+            if semaphores:
+                logger.info('Acquiring resources for %s', node)
+                await asyncio.gather(*semaphores)
+
+            logger.info('Submitting %s', node)
+            future = await self.submit(node)
+            await self.client.gather(future, asynchronous=True)
+        logger.info('%s succeeded', node)
+
+    async def scatter(self):
+        names = list(self.function_images)
+        # Scattered as a list, so that the futures get unique keys rather than
+        # the function names
+        futures = await self.client.scatter(
+            [self.store] + [
+                self.function_images[name]['callable'] for name in names
+            ],
+            broadcast=True,
+            hash=False,
+            asynchronous=True,
+        )
+        self.scattered_store, *function_futures = futures
+        self.scattered_functions = dict(zip(names, function_futures))
+
+    def submit(self, node):
+        """
+        Submit a call to the client. Calls submitted in the same iteration of
+        the event loop are gathered per function and sent to the client
+        together, so that wide graphs do not pay for one submission per call.
 
+        Returns
+        -------
+        asyncio.Future
+            Resolves to the dask future of the call
+        """
+        loop = asyncio.get_running_loop()
+        batch = self.batches.setdefault(node.function_name, [])
+        if not batch:
+            loop.call_soon(self.flush, node.function_name)
+        submitted = loop.create_future()
+        batch.append((node, submitted))
+        return submitted
 
-class GraphLock:
-    def __init__(self, value):
-        self.value = value
-        self.lock = asyncio.Lock()
+    def flush(self, function_name):
+        batch = self.batches.pop(function_name)
+        nodes = [node for node, _ in batch]
+        func = self.scattered_functions[function_name]
+        store = self.scattered_store
+        kwargs = self.submit_kwargs[function_name]
+        # Keys are built here rather than by the client, so that a call gets
+        # the same key whether it is submitted alone or in a batch
+        keys = [
+            f'{function_name}-{tokenize(node, func, store)}' for node in nodes
+        ]
+        try:
+            if len(nodes) == 1:
+                futures = [
+                    self.client.submit(_run, nodes[0], func, store,
+                                       key=keys[0], **kwargs)
+                ]
+            else:
+                futures = self.client.map(_run,
+                                          nodes,
+                                          [func] * len(nodes),
+                                          [store] * len(nodes),
+                                          key=keys,
+                                          **kwargs)
+        except Exception as e:
+            for _, submitted in batch:
+                submitted.set_exception(e)
+        else:
+            for (node, submitted), future in zip(batch, futures):
+                self.futures[node] = future
+                submitted.set_result(future)
 
-    async def __aenter__(self):
-        await self.lock.acquire()
-        return self.value
+    def successors(self, i):
+        start, stop = self.successor_offsets[i], self.successor_offsets[i + 1]
+        return self.successor_ids[start:stop]
 
-    async def __aexit__(self, *exc):
-        self.lock.release()
-        return not any(exc)
+    def cancel_descendants(self, i):
+        stack = list(self.successors(i))
+        while stack:
+            descendant = stack.pop()
+            if self.cancelled[descendant]:
+                continue
+            self.cancelled[descendant] = 1
+            logger.info('%s cancelled due to failed dependency',
+                        self.nodes[descendant])
+            stack.extend(self.successors(descendant))
@@ -2,8 +2,6 @@ from ..errors import XunInterfaceError
 from ..graph import CallNode
 from abc import ABC
 from abc import abstractmethod
-from copy import deepcopy
-import contextvars
 import logging
 
 
@@ -34,13 +32,9 @@ class Driver(ABC):
              global_resources):
         guarded_store = store.guarded()
 
-        def deepcp_impl(current_callnode, memo):
-            yield current_callnode
-
-        ctx = contextvars.copy_context()
-        ctx.run(CallNode._deepcopy_context.value.set,
-                deepcp_impl)
-        graph = ctx.run(deepcopy, graph)
+        # Drivers get their own copy of the graph structure, so that the
+        # blueprint graph is left intact. Call nodes are shared, not copied.
+        graph = graph.copy()
 
         self._exec(graph,
                    entry_call,
@@ -65,19 +59,88 @@ class Driver(ABC):
     def value_computed(callnode, store):
         return callnode in store
 
+    @staticmethod
+    def pending_graph(graph, entry_call, store):
+        """Pending graph
+
+        Find the part of the call graph that has to be executed to compute the
+        entry call. The store is asked which calls of the graph have been
+        computed in a single contains_many lookup. The graph is then walked
+        backwards from the entry call, and the walk stops at computed calls,
+        so that finished parts of resumed workflows are not scheduled.
+
+        Parameters
+        ----------
+        graph : nx.DiGraph
+            The call graph
+        entry_call : CallNode
+            The call whose value should be computed
+        store : Store
+            The store results are saved in
+
+        Returns
+        -------
+        nx.DiGraph
+            Subgraph view of the calls that have not been computed
+        """
+        computed = store.contains_many(
+            node for node in graph if isinstance(node, CallNode)
+        )
+        pending = set()
+        seen = set()
+        stack = [entry_call]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node in computed:
+                logger.info('%s already completed', node)
+                continue
+            pending.add(node)
+            stack.extend(graph.predecessors(node))
+        return graph.subgraph(pending)
+
+    @staticmethod
+    def interface_hashes(function_images):
+        """Interface hashes
+
+        Calls to interfaces are computed by their target calls, possibly while
+        a schedule is running. Pruning the graph before the run does not catch
+        these, so calls to these functions have to be checked again once they
+        are ready.
+
+        Parameters
+        ----------
+        function_images : mapping of function name to function image dict
+            The function images of the program
+
+        Returns
+        -------
+        frozenset of str
+            Hashes of the functions that can be written to by other functions
+        """
+        return frozenset().union(*(
+            func_img['callable'].interface_hashes
+            for func_img in function_images.values()
+        ))
+
     @staticmethod
     def compute_and_store(callnode, func, store):
         cached_store = store.cached()
         results = func(*callnode.args, **callnode.kwargs)
         results.send(None)
         results.send(cached_store)
+
+        # Results are written together once the function has finished
+        pending = []
         while True:
             try:
                 result_call, result = next(results)
                 if func.can_write_to(result_call):
-                    logger.debug(f'Storing result for {result_call} '
-                                 f'(interface of {callnode})')
-                    store.store(result_call, result)
+                    logger.debug('Storing result for %s (interface of %s)',
+                                 result_call, callnode)
+                    pending.append((result_call, result))
                 else:
                     msg = (f'Call {callnode} attempted to write an interface '
                            f'[{result_call.function_name}'
@@ -86,8 +149,17 @@ class Driver(ABC):
                     logger.error(msg)
                     raise XunInterfaceError(msg)
             except StopIteration as result:
-                logger.debug(f'Storing result for {callnode}')
-                store.store(callnode, result.value)
-                return result.value
+                return_value = result.value
+                break
             except Exception as e:
                 raise e from func.Raise()
+
+        # Nothing is stored for a function that fails, so interface results
+        # it yielded before failing are dropped along with its own result
+        logger.debug('Storing result for %s', callnode)
+        pending.append((callnode, return_value))
+        try:
+            store.store_many(pending)
+        except Exception as e:
+            raise e from func.Raise()
+        return return_value
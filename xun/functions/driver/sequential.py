@@ -1,7 +1,7 @@
 from .. import CallNode
+from ..errors import NotDAGError
 from .driver import Driver
 import logging
-import networkx as nx
 
 
 logger = logging.getLogger(__name__)
@@ -9,7 +9,8 @@ logger = logging.getLogger(__name__)
 
 class Sequential(Driver):
     """
-    Does a topological sort of the graph, and runs the jobs sequentially
+    Sorts the graph into levels of independent calls, and runs the jobs
+    sequentially, level by level
     """
 
     def _exec(self,
@@ -18,30 +19,77 @@ class Sequential(Driver):
               function_images,
               store,
               global_resources):
-        assert nx.is_directed_acyclic_graph(graph)
+        # Calls that were computed before the run are pruned with the graph,
+        # only calls to interfaces can be computed by others during the run
+        pending = self.pending_graph(graph, entry_call, store)
+        interface_hashes = self.interface_hashes(function_images)
 
-        schedule = list(nx.topological_sort(graph))
+        for depth, level in enumerate(_kahn_levels(pending)):
+            skipped = 0
+            for node in level:
+                func = function_images[node.function_name]['callable']
 
-        for node in schedule:
-            if not isinstance(node, CallNode):
-                continue
+                if (node.function_hash in interface_hashes
+                        and self.value_computed(node, store)):
+                    logger.info('%s already completed', node)
+                    skipped += 1
+                    continue
 
-            func = function_images[node.function_name]['callable']
+                logger.info('Running %s', node)
+                try:
+                    self.compute_and_store(node, func, store)
+                except Exception as e:
+                    logger.error('%s failed with %s', node, e)
+                    raise
+                logger.info('%s succeeded', node)
+            logger.debug('Level %d: %d calls run, %d already completed',
+                         depth, len(level) - skipped, skipped)
 
-            # Do not rerun finished jobs. For example if a workflow has been
-            # stopped and resumed.
-            if self.value_computed(node, store):
-                logger.info('{} already completed'.format(node))
-                continue
+        return store.load_callnode(entry_call)
 
-            logger.info('Running {}'.format(node))
-            try:
-                self.compute_and_store(node, func, store)
-            except Exception as e:
-                logger.error(
-                    '{} failed with {}'.format(node, str(e))
-                )
-                raise
-            logger.info('{} succeeded'.format(node))
 
-        return store.load_callnode(entry_call)
+def _kahn_levels(graph):
+    """Kahn levels
+
+    Sort a directed acyclic graph into levels using Kahn's algorithm [1]. Every
+    node in a level depends only on nodes in earlier levels, so the calls in a
+    level are independent of each other.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        The call graph
+
+    Yields
+    ------
+    list of CallNode
+        The call nodes of the graph, level by level. Levels are produced as
+        the sort proceeds, so the first calls can run before the whole graph
+        has been sorted.
+
+    Raises
+    ------
+    NotDAGError
+        If the graph has a cycle. The graphs of blueprints are checked when
+        they are built, so this is only raised after the levels preceding the
+        cycle have been produced.
+
+    .. [1] https://en.wikipedia.org/wiki/Topological_sorting#Kahn's_algorithm
+    """
+    in_degree = dict(graph.in_degree())
+    ready = [node for node, degree in in_degree.items() if degree == 0]
+    emitted = 0
+    while ready:
+        emitted += len(ready)
+        yield [node for node in ready if isinstance(node, CallNode)]
+        next_ready = []
+        for node in ready:
+            for successor in graph.successors(node):
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    next_ready.append(successor)
+        ready = next_ready
+
+    # Nodes on a cycle never reach an in-degree of zero
+    if emitted != len(in_degree):
+        raise NotDAGError
@@ -1,5 +1,6 @@
 from . import transformations as xform
 from .blueprint import Blueprint
+from .compatibility import ast
 from .errors import XunSyntaxError
 from .function_description import describe
 from .graph import CallNode
@@ -9,14 +10,15 @@ from abc import abstractmethod
 from itertools import chain
 from yapf.yapflib.style import CreatePEP8Style
 from yapf.yapflib.yapf_api import FormatCode
-import astor
 import base64
 import copy
 import hashlib
 import shutil
 
 
-def adjusted_line_layout(style=CreatePEP8Style()):
+def adjusted_line_layout(style=None):
+    if style is None:
+        style = CreatePEP8Style()
     columns = shutil.get_terminal_size().columns
     style['COLUMN_LIMIT'] = columns
     return style
@@ -53,16 +55,24 @@ class AbstractFunction(ABC):
         """
         def __init__(self, func):
             self.owner = func
+            self._formatted = {}
 
         @property
         def graph(self):
-            source = astor.to_source(self.owner.graph_builder.tree)
-            return FormatCode(source, style_config=adjusted_line_layout())[0]
+            return self._format('graph', self.owner.graph_builder.tree)
 
         @property
         def task(self):
-            source = astor.to_source(self.owner.callable.tree)
-            return FormatCode(source, style_config=adjusted_line_layout())[0]
+            return self._format('task', self.owner.callable.tree)
+
+        def _format(self, key, tree):
+            # Formatting is slow, so the code is formatted once per instance
+            if key not in self._formatted:
+                source = ast.unparse(tree)
+                style = adjusted_line_layout()
+                formatted, _ = FormatCode(source, style_config=style)
+                self._formatted[key] = formatted
+            return self._formatted[key]
 
         @property
         def source(self):
@@ -84,7 +94,11 @@ class AbstractFunction(ABC):
 
     @property
     def code(self):
-        return self.FunctionCode(self)
+        # The same instance is returned every time, so that formatted code is
+        # reused between accesses
+        if self._code is None:
+            self._code = self.FunctionCode(self)
+        return self._code
 
     @property
     @abstractmethod
@@ -115,11 +129,15 @@ class AbstractFunction(ABC):
         str
             Hex digest of function hash
         """
-        sha256 = hashlib.sha256()
-        sha256.update(self.desc.src.encode())
-        for dependency in self.dependencies.values():
-            if dependency is not self:
-                sha256.update(dependency.hash.encode())
+        # Hashing the concatenation gives the same digest as updating with
+        # each part in turn, in a single call
+        parts = [self.desc.src.encode()]
+        parts.extend(
+            dependency.hash.encode()
+            for dependency in self.dependencies.values()
+            if dependency is not self
+        )
+        sha256 = hashlib.sha256(b''.join(parts))
         return base64.urlsafe_b64encode(sha256.digest()).decode()
 
     def callnode(self, *args, **kwargs):
@@ -266,9 +284,24 @@ class Function(AbstractFunction):
         self._global_resources = {}
         self._worker_resources = {}
         self._hash = self.sha256()
+        self._globals = None
+        self._code = None
+        self._constants = None
         self._graph_builder = None
         self._callable = None
 
+    def __copy__(self):
+        # Compiled artifacts are shared with the copy, mutable attributes are
+        # not. The copy depends on itself rather than on the original.
+        func = Function.__new__(Function)
+        func.__dict__.update(self.__dict__)
+        func._dependencies = {**self._dependencies, self.name: func}
+        func.interfaces = self.interfaces.copy()
+        func._code = None
+        func._global_resources = self._global_resources.copy()
+        func._worker_resources = self._worker_resources.copy()
+        return func
+
     @property
     def name(self):
         return self.desc.name
@@ -291,17 +324,20 @@ class Function(AbstractFunction):
 
     @property
     def globals(self):
-        return {
-            **{
-                name: value for name, value in self.desc.globals.items()
-                if not isinstance(value, AbstractFunction)
-            },
-            **{
-                name: SymbolicFunction(f.name, f.hash)
-                for name, f in chain(self.dependencies.items(),
-                                     self.interfaces.items())
-            },
-        }
+        # Built once, and again only after an interface has been added
+        if self._globals is None:
+            self._globals = {
+                **{
+                    name: value for name, value in self.desc.globals.items()
+                    if not isinstance(value, AbstractFunction)
+                },
+                **{
+                    name: SymbolicFunction(f.name, f.hash)
+                    for name, f in chain(self.dependencies.items(),
+                                         self.interfaces.items())
+                },
+            }
+        return self._globals
 
     @staticmethod
     def from_function(func, max_parallel=None):
@@ -340,12 +376,31 @@ class Function(AbstractFunction):
         return f
 
     @property
-    def graph_builder(self):
-        if self._graph_builder is None:
-            _, constants = xform.separate_constants(self.desc)
+    def constants(self):
+        """Constants
+
+        The function body and its with constants statement, sorted and
+        prepared for execution. This is shared by the graph builder and the
+        callable, the transformations do not modify their arguments.
+
+        Returns
+        -------
+        (List[ast.AST], List[ast.AST])
+            The function body without the with constants statement, and the
+            sorted and unpacked constant assignments
+        """
+        if self._constants is None:
+            body, constants = xform.separate_constants(self.desc)
             sorted_constants, _ = xform.sort_constants(constants)
             pass_by_value = xform.pass_by_value(sorted_constants)
             unpacked = xform.unpack_unpacking_assignments(pass_by_value)
+            self._constants = body, unpacked
+        return self._constants
+
+    @property
+    def graph_builder(self):
+        if self._graph_builder is None:
+            _, unpacked = self.constants
             xun_graph = xform.build_xun_graph(unpacked)
 
             self._graph_builder = xform.assemble(
@@ -366,10 +421,7 @@ class Function(AbstractFunction):
             arg_names = func_arg_names(self.desc.ast.body[0])
 
             head = xform.generate_header()
-            body, constants = xform.separate_constants(self.desc)
-            sorted_constants, _ = xform.sort_constants(constants)
-            pass_by_value = xform.pass_by_value(sorted_constants)
-            unpacked = xform.unpack_unpacking_assignments(pass_by_value)
+            body, unpacked = self.constants
             load_args = xform.load_args(body, arg_names)
             yields = xform.transform_yields(load_args, arg_names)
             load_constants = xform.load_constants(yields, unpacked)
@@ -392,6 +444,7 @@ class Function(AbstractFunction):
         interface_desc = describe(func)
         interface = Interface(self, interface_desc)
         self.interfaces[interface.name] = interface
+        self._globals = None
         return interface
 
 
@@ -451,7 +504,7 @@ def global_resource(res_type, number, *, default_available):
 
     """
     def decorator(func):
-        func_prime = copy.deepcopy(func)
+        func_prime = copy.copy(func)
         func_prime._global_resources[res_type] = (number, default_available)
         return func_prime
     return decorator
@@ -473,7 +526,7 @@ def worker_resource(res_type, number):
 
     """
     def decorator(func):
-        func_prime = copy.deepcopy(func)
+        func_prime = copy.copy(func)
         func_prime._worker_resources[res_type] = number
         return func_prime
     return decorator
@@ -492,6 +545,8 @@ class Interface(AbstractFunction):
             target.name: target,
         }
         self._hash = self.sha256()
+        self._globals = None
+        self._code = None
         self._graph_builder = None
         self._callable = None
 
@@ -509,16 +564,18 @@ class Interface(AbstractFunction):
 
     @property
     def globals(self):
-        return {
-            **{
-                name: value for name, value in self.desc.globals.items()
-                if not isinstance(value, AbstractFunction)
-            },
-            **{
-                name: SymbolicFunction(f.name, f.hash)
-                for name, f in self.dependencies.items()
-            },
-        }
+        if self._globals is None:
+            self._globals = {
+                **{
+                    name: value for name, value in self.desc.globals.items()
+                    if not isinstance(value, AbstractFunction)
+                },
+                **{
+                    name: SymbolicFunction(f.name, f.hash)
+                    for name, f in self.dependencies.items()
+                },
+            }
+        return self._globals
 
     @property
     def graph_builder(self):
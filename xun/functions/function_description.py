@@ -1,10 +1,10 @@
 from .compatibility import ast
 from .util import func_external_names
-from .util import function_ast
 from .util import function_source
 from .util import strip_decorators
 from collections import namedtuple
 from itertools import dropwhile
+import functools
 import inspect
 
 
@@ -34,23 +34,28 @@ ModuleAlias = namedtuple(
 )
 
 
-def describe(func):
-    """ Describe function
+@functools.lru_cache(maxsize=1024)
+def describe_source(src):
+    """ Describe source
 
-    .. note:: Any function decorators will be removed
+    Parse the source code of a function and find its externally referenced
+    names. This only depends on the source code, so the result is cached and
+    shared between functions with the same definition. The source is read
+    again for every function described, so edited definitions are described
+    from their new source.
 
     Parameters
     ----------
-    func : function
-        Function to describe
+    src : str
+        The source code of the function
 
     Returns
     -------
-    FunctionDescription
-        Description of the given function
+    (str, ast.Module, frozenset of str)
+        Source code and syntax tree without xun decorators, and the externally
+        referenced names
     """
-    src = function_source(func)
-    tree = function_ast(func)
+    tree = ast.parse(src)
 
     is_single_function_module = (
         isinstance(tree, ast.Module)
@@ -72,6 +77,27 @@ def describe(func):
     # modules that are actually used.
     external_names = func_external_names(tree.body[0])
 
+    return src, tree, external_names
+
+
+def describe(func):
+    """ Describe function
+
+    .. note:: Any function decorators will be removed
+
+    Parameters
+    ----------
+    func : function
+        Function to describe
+
+    Returns
+    -------
+    FunctionDescription
+        Description of the given function
+    """
+    code = inspect.unwrap(func).__code__
+    src, tree, external_names = describe_source(function_source(code))
+
     external_references = {
         name: value
         for name, value in func.__globals__.items()
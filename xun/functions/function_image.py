@@ -1,10 +1,12 @@
+from .compatibility import ast
 from .errors import FunctionError
 from .errors import XunInterfaceError
 from .function_description import describe
 from .util import overwrite_scope
-import astor
 import functools
 import importlib
+import importlib.util
+import marshal
 
 
 class FunctionImage:
@@ -43,6 +45,13 @@ class FunctionImage:
     interface_hashes : frozenset[str]
         The set of hashes to xun interfaces this function is allowed to yield
         results to
+    _source_code : str
+        Cached source code generated from the tree. _source_code is not
+        pickled.
+    _code : code
+        Cached code object of the compiled module. It is pickled along with the
+        bytecode version it was compiled for, and only reused by interpreters
+        with the same bytecode version.
     _func : function
         Cached compiled function. _func is not pickled.
 
@@ -96,6 +105,8 @@ class FunctionImage:
         self.hash = hash
         self.original_source_code = original_source_code
         self.interface_hashes = interface_hashes
+        self._source_code = None
+        self._code = None
         self._func = None
 
     @staticmethod
@@ -159,9 +170,7 @@ class FunctionImage:
         function
             Python function
         """
-        function_code = compile(self.source_code,
-                                '<xun-function-image>',
-                                'exec')
+        function_code = self.code
 
         globals = {
             '__builtins__': __builtins__,
@@ -180,13 +189,27 @@ class FunctionImage:
 
         return f
 
+    @property
+    def code(self):
+        """Code object of the module defining the function, compiled once"""
+        if self._code is None:
+            # Generated code must not depend on the __future__ imports in
+            # effect where the image happens to be compiled
+            self._code = compile(self.source_code,
+                                 '<xun-function-image>',
+                                 'exec',
+                                 dont_inherit=True)
+        return self._code
+
     @property
     def name(self):
         return self.__name__
 
     @property
     def source_code(self):
-        return astor.to_source(self.tree)
+        if self._source_code is None:
+            self._source_code = ast.unparse(self.tree)
+        return self._source_code
 
     def Raise(self):
         return FunctionError(
@@ -227,7 +250,9 @@ class FunctionImage:
     def __getstate__(self):
         """
         Controls how FunctionImage objects are pickled. We store everything
-        except the cached compiled function `_func`.
+        except the cached compiled function `_func`. The code object is
+        compiled here, if it has not been already, so that unpickling
+        processes running the same Python version do not have to.
         """
         return (
             self.tree,
@@ -241,12 +266,15 @@ class FunctionImage:
             self.original_source_code,
             self.interface_hashes,
             self.hash,
+            (importlib.util.MAGIC_NUMBER, marshal.dumps(self.code)),
         )
 
     def __setstate__(self, state):
         """
         Controls how FunctionImage objects are unpickled. We store everything
-        except the cached compiled function `_func`.
+        except the cached compiled function `_func`. Code objects compiled for
+        a different bytecode version are discarded, and compiled again when
+        needed.
         """
         self.tree = state[0]
         self.__name__ = state[1]
@@ -259,8 +287,16 @@ class FunctionImage:
         self.original_source_code = state[8]
         self.interface_hashes = state[9]
         self.hash = state[10]
+        self._source_code = None
+        self._code = None
         self._func = None
 
+        # Images pickled by earlier versions do not include the code object
+        if len(state) > 11:
+            magic_number, code = state[11]
+            if magic_number == importlib.util.MAGIC_NUMBER:
+                self._code = marshal.loads(code)  # nosec
+
     def __repr__(self):
         return f'<FunctionImage: {self.__name__} #{self.hash}>'
 
@@ -50,6 +50,19 @@ class CallNode:
     kwargs : mapping of str to arguments
         the keyword arguments of this call
     """
+    # Attributes are fixed, and the hash of a node is computed at most once.
+    # Nested call nodes are hashed through their arguments, so without caching
+    # hashing deeply nested calls would be exponential in the nesting depth.
+    __slots__ = (
+        'function_name',
+        'function_hash',
+        'subscript',
+        'args',
+        'kwargs',
+        '_hash',
+    )
+    _fields = __slots__[:-1]
+
     class _deepcopy_context:
         """
         `deepcopy` has different effects on callnode depending on the context
@@ -97,6 +110,7 @@ class CallNode:
         self.subscript = ()
         self.args = make_hashable(args)
         self.kwargs = make_hashable(kwargs)
+        self._hash = None
 
     def __getitem__(self, key):
         return self._replace(subscript=self.subscript + (key,))
@@ -109,6 +123,15 @@ class CallNode:
                         'detect call graphs. A regular copy of a callnode '
                         'is usually an indication of an error.')
 
+    def __reduce__(self):
+        return _rebuild_callnode, (
+            self.function_name,
+            self.function_hash,
+            self.subscript,
+            self.args,
+            self.kwargs,
+        )
+
     def __deepcopy__(self, memo):
         """
         deepcopy of Callnodes are only allowed when used internally by xun
@@ -133,13 +156,15 @@ class CallNode:
             return False
 
     def __hash__(self):
-        return hash((
-            self.function_name,
-            self.function_hash,
-            self.subscript,
-            tuple(self.args),
-            frozenset(self.kwargs.items())
-        ))
+        if self._hash is None:
+            self._hash = hash((
+                self.function_name,
+                self.function_hash,
+                self.subscript,
+                tuple(self.args),
+                frozenset(self.kwargs.items())
+            ))
+        return self._hash
 
     def __repr__(self):
         args = [repr(self.function_name), repr(self.function_hash)]
@@ -175,11 +200,13 @@ class CallNode:
         -------
         A new CallNode with replaced attributes
         """
-        attribs = {k: kwargs.pop(k, v) for k, v in vars(self).items()}
+        attribs = {k: kwargs.pop(k, getattr(self, k)) for k in self._fields}
         if kwargs:
             raise ValueError(f'Got unexpected field names: {list(kwargs)!r}')
         inst = CallNode.__new__(CallNode)
-        inst.__dict__.update(attribs)
+        for k, v in attribs.items():
+            setattr(inst, k, v)
+        inst._hash = None
         return inst
 
     @property
@@ -189,3 +216,18 @@ class CallNode:
         new_hash = base64.urlsafe_b64encode(sha256).decode()
         return self._replace(function_name=f'proxy<{self.function_name}>',
                              function_hash=new_hash)
+
+
+def _rebuild_callnode(function_name, function_hash, subscript, args, kwargs):
+    """
+    Recreate a pickled CallNode. The arguments are already hashable, so they
+    are set directly rather than passed through the constructor.
+    """
+    inst = CallNode.__new__(CallNode)
+    inst.function_name = function_name
+    inst.function_hash = function_hash
+    inst.subscript = subscript
+    inst.args = args
+    inst.kwargs = kwargs
+    inst._hash = None
+    return inst
@@ -104,6 +104,10 @@ def detect_dependencies_by_deepcopy(*objects):
     """
     graph = nx.DiGraph()
 
+    # Copies of the callnodes that have been explored. A callnode referenced
+    # from several places only has its arguments searched once.
+    explored = {}
+
     depth_first_search_ctx = contextvars.ContextVar('depth_first_search_ctx')
 
     def deepcopy_impl(current_callnode, memo):
@@ -116,6 +120,10 @@ def detect_dependencies_by_deepcopy(*objects):
         if outer_callnode is not None:
             graph.add_edge(current_callnode, outer_callnode)
 
+        if current_callnode in explored:
+            yield explored[current_callnode]
+            return
+
         next_context = contextvars.copy_context()
         next_context.run(depth_first_search_ctx.set, (current_callnode,))
 
@@ -124,7 +132,9 @@ def detect_dependencies_by_deepcopy(*objects):
         args = next_context.run(deepcopy, current_callnode.args, memo=None)
         kwargs = next_context.run(deepcopy, current_callnode.kwargs, memo=None)
 
-        yield current_callnode._replace(args=args, kwargs=kwargs)
+        copied = current_callnode._replace(args=args, kwargs=kwargs)
+        explored[current_callnode] = copied
+        yield copied
 
     ctx = contextvars.copy_context()
     ctx.run(CallNode._deepcopy_context.value.set, deepcopy_impl)
@@ -4,6 +4,7 @@ from collections import namedtuple
 from pathlib import Path
 import contextlib
 import functools
+import os
 import shutil
 import tempfile
 import time
@@ -61,8 +62,9 @@ class Disk(Store):
         """
         if root is None:
             root = self.dir
-        return Paths(key=root / 'keys' / key.sha256(),
-                     val=root / 'values' / key.sha256())
+        digest = key.sha256()
+        return Paths(key=root / 'keys' / digest,
+                     val=root / 'values' / digest)
 
     @retry(on_exceptions=AssertionError)
     def key_invariant(self, key):
@@ -77,6 +79,15 @@ class Disk(Store):
     def __contains__(self, key):
         return self.paths(key).key.is_file()
 
+    def contains_many(self, keys):
+        # One listing of the key directory instead of a stat per key
+        try:
+            with os.scandir(self.dir / 'keys') as entries:
+                digests = {entry.name for entry in entries}
+        except FileNotFoundError:
+            return set()
+        return {key for key in keys if key.sha256() in digests}
+
     @retry(on_exceptions=(KeyError, FileNotFoundError))
     def _load_value(self, key):
         if __debug__:
@@ -98,8 +109,11 @@ class Disk(Store):
         with tempfile.TemporaryDirectory(dir=self.tmpdir) as tmpdir:
             tmpdir = Path(tmpdir)
 
-            temp_paths = self.paths(key, root=tmpdir)
             real_paths = self.paths(key)
+            temp_paths = Paths(
+                key=tmpdir / 'keys' / real_paths.key.name,
+                val=tmpdir / 'values' / real_paths.val.name,
+            )
 
             with contextlib.ExitStack() as exit_stack:
                 temp_paths.key.parent.mkdir(parents=True, exist_ok=True)
@@ -41,6 +41,15 @@ class Layered(Store):
     def __contains__(self, callnode):
         return any(callnode in layer for layer in self._layers)
 
+    def contains_many(self, callnodes):
+        remaining = set(callnodes)
+        contained = set()
+        for layer in self._layers:
+            found = layer.contains_many(remaining)
+            contained |= found
+            remaining -= found
+        return contained
+
     def _load_value(self, callnode):
         for layer in self._layers:
             if callnode in layer:
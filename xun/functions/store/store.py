@@ -85,6 +85,38 @@ class Store(ABC):
             self._store(proxy_callnode, value._referencing)
         self._store(key, value, **tags)
 
+    def store_many(self, items):
+        """Store many
+
+        Store several results. Stores that can write more efficiently in bulk
+        should override this.
+
+        Parameters
+        ----------
+        items : iterable of (CallNode, Any)
+            Keys and the values to store for them
+        """
+        for key, value in items:
+            self.store(key, value)
+
+    def contains_many(self, keys):
+        """Contains many
+
+        Find which of several keys are in the store. Stores that can look up
+        keys more efficiently in bulk should override this.
+
+        Parameters
+        ----------
+        keys : iterable of CallNode
+            The keys to look up
+
+        Returns
+        -------
+        set of CallNode
+            The keys that are in the store
+        """
+        return {key for key in keys if key in self}
+
     def load_callnode(self, callnode):
         result = self._load_value(callnode._replace(subscript=()))
         for subscript in callnode.subscript:
@@ -120,6 +152,9 @@ class GuardedStore(Store):
     def __contains__(self, key):
         return key in self._wrapped_store
 
+    def contains_many(self, keys):
+        return self._wrapped_store.contains_many(keys)
+
     def _load_value(self, key):
         return self._wrapped_store._load_value(key)
 
@@ -135,6 +170,21 @@ class GuardedStore(Store):
         self._written.add(key)
         return self._wrapped_store._store(key, value, **tags)
 
+    def store_many(self, items):
+        items = list(items)
+        keys = []
+        for key, value in items:
+            if isinstance(value, serialization.Reference) and value.is_new:
+                keys.append(key.proxy_callnode)
+            keys.append(key)
+        seen = set()
+        for key in keys:
+            if key in self._written or key in seen:
+                raise self.StoreError(f'Multiple results for {key}')
+            seen.add(key)
+        self._wrapped_store.store_many(items)
+        self._written.update(keys)
+
     def remove(self, key):
         self._wrapped_store.remove(key)
 
@@ -150,6 +200,9 @@ class CachedStore(Store):
     def __contains__(self, key):
         return key in self._wrapped_store
 
+    def contains_many(self, keys):
+        return self._wrapped_store.contains_many(keys)
+
     def _load_value(self, key):
         try:
             return self._cache[key]
@@ -1,9 +1,9 @@
 """Transformations
 
 This module includes functionality for working with and manipulating function
-code. The FunctionDecomposition class provides a data structure to make
-managing code fragments easier, while the transformation functions are used to
-generate xun scheduling and execution code.
+code. The transformation functions take and return lists of ast nodes, and are
+composed to generate xun scheduling and execution code. The fragments are
+combined into a FunctionImage by `assemble`.
 
 The code is represented by and manipulated with the python ast module [1][2].
 
@@ -31,6 +31,44 @@ import copy
 import functools
 
 
+class CachedDispatch:
+    """Cached dispatch
+
+    Mixin for ast.NodeVisitor and ast.NodeTransformer subclasses. The visitor
+    method for a node type is looked up once per class, rather than by name for
+    every visited node.
+
+    Examples
+    --------
+
+    >>> class NameCounter(CachedDispatch, ast.NodeVisitor):
+    ...     def __init__(self):
+    ...         self.count = 0
+    ...     def visit_Name(self, node):
+    ...         self.count += 1
+    ...
+    >>> counter = NameCounter()
+    >>> counter.visit(ast.parse('a + b'))
+    >>> counter.count
+    2
+    """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visitors = {}
+
+    def visit(self, node):
+        node_type = type(node)
+        try:
+            visitor = self._visitors[node_type]
+        except KeyError:
+            cls = type(self)
+            visitor = getattr(cls,
+                              'visit_' + node_type.__name__,
+                              cls.generic_visit)
+            self._visitors[node_type] = visitor
+        return visitor(self, node)
+
+
 def assemble(desc,
              *nodes,
              globals=None,
@@ -140,9 +178,7 @@ def generate_header():
 def separate_constants(func_desc: FunctionDescription):
     """Separate constants
 
-    Seperate the with constants from the body. The FunctionDecomposition is
-    updated with new attributes `body` and `constants`. Attribute `ast` is
-    deleted.
+    Seperate the with constants from the body of the described function.
 
     Parameters
     ----------
@@ -150,7 +186,9 @@ def separate_constants(func_desc: FunctionDescription):
 
     Returns
     -------
-    FunctionDecomposition
+    Tuple[List[ast.AST], List[ast.AST]]
+        The function body without the with constants statement, and the
+        statements inside the with constants statement
     """
     body, constants = separate_constants_ast(func_desc.ast.body[0].body)
     return body, constants
@@ -161,9 +199,8 @@ def sort_constants(constants: List[ast.AST]):
     """Sort constants
 
     Sort the statements from the with constants statement such that they can be
-    evaluated sequentially. The resulting FunctionDecomposition has new
-    attributes `sorted_constants` and `constant_graph`. Attributes `constants`
-    is deleted.
+    evaluated sequentially. The dependency graph between the statements is
+    returned along with the sorted statements.
 
     Parameters
     ----------
@@ -194,7 +231,7 @@ def pass_by_value(sorted_constants: List[ast.AST]):
     -------
     List[ast.AST]
     """
-    class CallArgumentCopyTransformer(ast.NodeTransformer):
+    class CallArgumentCopyTransformer(CachedDispatch, ast.NodeTransformer):
         def visit_Call(self, node):
             node = self.generic_visit(node)
 
@@ -243,7 +280,7 @@ def unpack_unpacking_assignments(copy_only_constants: List[ast.AST]):
     def lhs_is_iterable(node):
         return isinstance(node.targets[0], (ast.Tuple, ast.List))
 
-    class UnpackUnpackingAssignments(ast.NodeTransformer):
+    class UnpackUnpackingAssignments(CachedDispatch, ast.NodeTransformer):
         def visit_Assign(self, node):
             if not lhs_is_iterable(node):
                 self.generic_visit(node)
@@ -288,7 +325,7 @@ def build_xun_graph(unpacked_assignments: List[ast.AST]):
 
     This transformation will generate code such that any call to a xun function
     is registered in a graph. The new code will return a dependency graph for
-    the function assembled from the FunctionDecomposition.
+    the function assembled from these statements.
 
     This version of the code is final and will be run during scheduling.
 
@@ -300,7 +337,7 @@ def build_xun_graph(unpacked_assignments: List[ast.AST]):
     -------
     List[ast.AST]
     """
-    class AssignVisitor(ast.NodeVisitor):
+    class AssignVisitor(CachedDispatch, ast.NodeVisitor):
         def __init__(self):
             self.introduced_names = set()
 
@@ -328,7 +365,7 @@ def build_xun_graph(unpacked_assignments: List[ast.AST]):
     )
 
     detect_dependencies_by_deepcopy = ast.Name(
-        id='_xun_detect_dependencies_by_deepcopy', context=ast.Load())
+        id='_xun_detect_dependencies_by_deepcopy', ctx=ast.Load())
 
     unnamed_statements = [
         expr for expr in unpacked_assignments
@@ -418,7 +455,7 @@ def transform_yields(body: List[ast.AST], function_arg_names):
     -------
     List[ast.AST]
     """
-    class yield_transformer(ast.NodeTransformer):
+    class yield_transformer(CachedDispatch, ast.NodeTransformer):
         is_interface_args = contextvars.ContextVar(
             'is_interface_args', default=False)
 
@@ -481,7 +518,7 @@ def load_constants(body: List[ast.AST], unpacked_assignments: List[ast.AST]):
     -------
     List[ast.AST]
     """
-    class DiscoverReferences(ast.NodeVisitor):
+    class DiscoverReferences(CachedDispatch, ast.NodeVisitor):
         def __init__(self):
             self.seen_targets = set()
 
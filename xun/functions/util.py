@@ -574,6 +574,13 @@ def has_mutating_assignments(node):
     return False
 
 
+# Types make_hashable returns as is. Checked by exact type before the slower
+# abstract base class checks, since these make up most arguments.
+_HASHABLE_LEAF_TYPES = frozenset({
+    bool, bytes, complex, float, int, str, type(None)
+})
+
+
 def make_hashable(a):
     """Recursively turns `a` and, its descendants, into hashable type.
 
@@ -594,6 +601,14 @@ def make_hashable(a):
     TypeError
         If the type of the argument is unhashable.
     """
+    cls = type(a)
+    if cls in _HASHABLE_LEAF_TYPES:
+        return a
+    if cls is tuple or cls is list:
+        return tuple(make_hashable(v) for v in a)
+    if cls is dict:
+        return frozenmap({k: make_hashable(v) for k, v in a.items()})
+
     if isinstance(a, str) or isinstance(a, bytes):
         return a
     if isinstance(a, collections.abc.ByteString):
@@ -604,6 +619,13 @@ def make_hashable(a):
         # Convert sets to sequences so that order is retained for sets like
         # `dict_items`
         return tuple(make_hashable(v) for v in a)
+
+    # Callnodes are immutable and hashable, forward them without trying to
+    # iterate over them below
+    from .graph import CallNode
+    if cls is CallNode:
+        return a
+
     try:
         # Callnodes satisfy Iterable, but cannot be iterated over. We therefore
         # have to just try and recover if we fail.
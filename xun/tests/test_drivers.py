@@ -1,10 +1,12 @@
 from .helpers import PicklableMemoryStore
 from .helpers import sample_sin_blueprint
+from xun.functions.driver.sequential import _kahn_levels
 from dask.distributed import Client, LocalCluster
 from contextlib import closing
 from concurrent.futures import Future
 from unittest.mock import patch
 import dask
+import networkx as nx
 import pytest
 import xun
 
@@ -22,6 +24,209 @@ def test_dask_driver():
     assert result == expected
 
 
+def test_dask_driver_submits_ready_calls_together():
+    client = Client(processes=False)
+    dask_driver = xun.functions.driver.Dask(client)
+
+    with closing(client):
+        blueprint, expected = sample_sin_blueprint(sample_count=4)
+
+        with patch.object(Client, 'map', autospec=True,
+                          side_effect=Client.map) as map_mock:
+            with PicklableMemoryStore() as store:
+                result = blueprint.run(driver=dask_driver, store=store)
+
+    assert result == expected
+    mapped_nodes = [
+        [node.function_name for node in args[2]]
+        for args, _ in map_mock.call_args_list
+    ]
+    # The samples are all ready at the start, and should be submitted at once
+    assert ['mksample'] * 4 in mapped_nodes
+
+    # Batched calls get the same per-call keys as calls submitted alone
+    for args, kwargs in map_mock.call_args_list:
+        keys = kwargs['key']
+        assert len(set(keys)) == len(args[2])
+        for key, node in zip(keys, args[2]):
+            assert key.startswith(f'{node.function_name}-')
+
+
+def test_dask_driver_does_not_submit_descendants_of_failed_calls():
+    @xun.function()
+    def fails():
+        raise RuntimeError('failed on purpose')
+
+    @xun.function()
+    def depends_on_failure():
+        return value
+        with ...:
+            value = fails()
+
+    @xun.function()
+    def succeeds():
+        return 1
+
+    @xun.function()
+    def main():
+        return a + b
+        with ...:
+            a = depends_on_failure()
+            b = succeeds()
+
+    client = Client(processes=False)
+    dask_driver = xun.functions.driver.Dask(client)
+
+    with closing(client):
+        with patch.object(Client, 'submit', autospec=True,
+                          side_effect=Client.submit) as submit_mock:
+            with PicklableMemoryStore() as store:
+                with pytest.raises(xun.functions.ComputeError):
+                    main.blueprint().run(driver=dask_driver, store=store)
+
+    submitted = {
+        args[2].function_name for args, _ in submit_mock.call_args_list
+    }
+    assert submitted == {'fails', 'succeeds'}
+
+
+def test_dask_driver_does_not_run_interface_calls_written_by_target():
+    @xun.function()
+    def f():
+        return 1
+
+    @xun.function()
+    def g(arg):
+        yield interface(arg) is arg
+
+    @g.interface
+    def interface(arg):
+        yield from g(arg)
+
+    @xun.function()
+    def h():
+        return b
+        with ...:
+            a = f()
+            b = interface(a)
+
+    client = Client(processes=False)
+    dask_driver = xun.functions.driver.Dask(client)
+    with closing(client):
+        with PicklableMemoryStore() as store:
+            result = h.blueprint().run(driver=dask_driver, store=store)
+
+    assert result == 1
+
+
+def test_pending_graph_stops_at_computed_calls():
+    blueprint, expected = sample_sin_blueprint(sample_count=2)
+    graph = blueprint.graph
+    Driver = xun.functions.driver.Driver
+
+    with PicklableMemoryStore() as store:
+        pending = Driver.pending_graph(graph, blueprint.call, store)
+        assert set(pending) == set(graph)
+
+        computed = next(
+            n for n in graph if n.function_name == 'deg_to_rad'
+        )
+        store.store(computed, 0.0)
+        pending = Driver.pending_graph(graph, blueprint.call, store)
+        assert computed not in pending
+        assert not any(p in pending for p in graph.predecessors(computed))
+        assert blueprint.call in pending
+
+        store.store(blueprint.call, expected)
+        pending = Driver.pending_graph(graph, blueprint.call, store)
+        assert len(pending) == 0
+
+
+def test_pending_graph_looks_up_calls_in_bulk():
+    class BulkLookupStore(PicklableMemoryStore):
+        def __init__(self):
+            super().__init__()
+            self.lookups = []
+
+        def __contains__(self, key):
+            raise AssertionError('Calls should be looked up in bulk')
+
+        def contains_many(self, keys):
+            keys = list(keys)
+            self.lookups.append(keys)
+            return {key for key in keys if key in self._container}
+
+    blueprint, expected = sample_sin_blueprint(sample_count=2)
+    graph = blueprint.graph
+    Driver = xun.functions.driver.Driver
+
+    with BulkLookupStore() as store:
+        Driver.pending_graph(graph, blueprint.call, store)
+        assert len(store.lookups) == 1
+        assert set(store.lookups[0]) == set(graph)
+
+
+def test_failed_call_stores_no_interface_results():
+    @xun.function()
+    def f():
+        yield g() is 1
+        raise ValueError('failed after writing g')
+
+    @f.interface
+    def g():
+        yield from f()
+
+    with PicklableMemoryStore() as store:
+        with pytest.raises(ValueError):
+            f.blueprint().run(
+                driver=xun.functions.driver.Sequential(),
+                store=store,
+            )
+        assert g.callnode() not in store
+        assert f.callnode() not in store
+
+
+def test_store_errors_are_chained_from_function():
+    class FailingStore(PicklableMemoryStore):
+        def store_many(self, items):
+            raise OSError('store unavailable')
+
+    @xun.function()
+    def f():
+        return 1
+
+    with FailingStore() as store:
+        with pytest.raises(OSError) as exc_info:
+            f.blueprint().run(
+                driver=xun.functions.driver.Sequential(),
+                store=store,
+            )
+    assert isinstance(exc_info.value.__cause__, xun.FunctionError)
+
+
+def test_sequential_levels_depend_only_on_earlier_levels():
+    blueprint, expected = sample_sin_blueprint(sample_count=3)
+    graph = blueprint.graph
+
+    levels = list(_kahn_levels(graph))
+    level_of = {n: i for i, level in enumerate(levels) for n in level}
+
+    assert set(level_of) == set(graph)
+    assert len(levels[0]) == 3
+    for u, v in graph.edges():
+        assert level_of[u] < level_of[v]
+
+
+def test_sequential_levels_raise_on_cycles():
+    a = xun.functions.CallNode('a', 'hash_a')
+    b = xun.functions.CallNode('b', 'hash_b')
+    c = xun.functions.CallNode('c', 'hash_c')
+    graph = nx.DiGraph([(a, b), (b, c), (c, b)])
+
+    with pytest.raises(xun.functions.NotDAGError):
+        list(_kahn_levels(graph))
+
+
 def test_dask_driver_graph_intactibility():
     blueprint, expected = sample_sin_blueprint()
 
@@ -3,10 +3,12 @@ from .helpers import PicklableMemoryStore
 from .helpers import run_in_process
 from .helpers import sample_sin_blueprint
 from xun.functions import CallNode
+from xun.functions import FunctionImage
 from xun.functions import XunSyntaxError
 from xun.functions import XunInterfaceError
 from xun.functions.store.store import GuardedStore
 import networkx as nx
+import pickle
 import pytest
 import xun
 
@@ -1117,6 +1119,20 @@ def test_yield_failure_on_multiple_write():
         run_in_process(f.blueprint())
 
 
+def test_function_globals_include_interfaces_added_later():
+    @xun.function()
+    def f():
+        pass
+
+    assert 'g' not in f.globals
+
+    @f.interface
+    def g():
+        yield from f()
+
+    assert f.globals['g'] == xun.functions.SymbolicFunction(g.name, g.hash)
+
+
 def test_yield_only_from_correct_interface():
     @xun.function()
     def f():
@@ -1227,3 +1243,23 @@ def test_higher_order_functions():
             result = f(odd, even, 5)
 
     assert run_in_process(a.blueprint(5)) == 18
+
+
+def test_function_image_pickles_compiled_code():
+    def f(a, b):
+        return a + b
+
+    img = FunctionImage.from_function(f)
+    unpickled = pickle.loads(pickle.dumps(img))
+
+    assert unpickled._code is not None
+    assert unpickled(1, 2) == 3
+
+    # Code compiled for another bytecode version is compiled again
+    state = img.__getstate__()
+    state = (*state[:-1], (b'\x00\x00\r\n', state[-1][1]))
+    other_version = FunctionImage.__new__(FunctionImage)
+    other_version.__setstate__(state)
+
+    assert other_version._code is None
+    assert other_version(1, 2) == 3
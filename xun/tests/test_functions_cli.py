@@ -1,6 +1,10 @@
 from xun.functions import cli
 from xun import XunSyntaxError
+import cloudpickle
+import os
 import pytest
+import subprocess
+import sys
 
 
 module = cli.load_module('xun/tests/test_data/script.py')
@@ -33,8 +37,49 @@ def test_syntax_errors():
     with pytest.raises(XunSyntaxError):
         cli.interpret_call('for i in range(5): f(i)', module)
 
+    with pytest.raises(XunSyntaxError):
+        cli.interpret_call('x = f()', module)
+
     with pytest.raises(XunSyntaxError):
         cli.interpret_call('1 + 1', module)
 
     with pytest.raises(XunSyntaxError):
         cli.interpret_call('(1 + 1)()', module)
+
+
+def test_load_module_reuses_loaded_script(tmp_path):
+    script = tmp_path / 'script.py'
+    script.write_text('value = 1\n')
+
+    first = cli.load_module(script)
+    second = cli.load_module(script)
+    assert first is second
+    assert first.value == 1
+
+    script.write_text('value = 2\n')
+    os.utime(script, ns=(0, script.stat().st_mtime_ns + 1))
+    reloaded = cli.load_module(script)
+    assert reloaded.value == 2
+
+    # Edits that keep the modification time and size are picked up too
+    stat = script.stat()
+    script.write_text('value = 3\n')
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert script.stat().st_mtime_ns == stat.st_mtime_ns
+    assert cli.load_module(script).value == 3
+
+
+def test_load_module_objects_pickle_by_value(tmp_path):
+    script = tmp_path / 'script.py'
+    script.write_text('def helper():\n    return 1\n')
+
+    loaded = cli.load_module(script)
+    pickled = cloudpickle.dumps(loaded.helper)
+
+    # Load in a fresh interpreter, where the script module does not exist
+    unpickle = 'import pickle, sys; print(pickle.load(sys.stdin.buffer)())'
+    result = subprocess.run([sys.executable, '-c', unpickle],
+                            input=pickled,
+                            stdout=subprocess.PIPE,
+                            check=True)
+    assert result.stdout.strip() == b'1'
@@ -1,5 +1,7 @@
 from xun.functions.graph import CallNode
+from xun.functions.runtime import detect_dependencies_by_deepcopy
 from xun.functions.runtime import unpack
+import pickle
 
 
 def test_unpack_python_types():
@@ -66,3 +68,41 @@ def test_unpack_starred():
     (x, (y, ys), xs) = unpack(shape, cn)
     expected = (cn[0], (cn[1][0], cn[1][1:]), cn[2:])
     assert (x, (y, ys), xs) == expected
+
+
+def test_callnode_pickle_roundtrip():
+    cn = CallNode('f', 'hash', 1, [2, 3], x={'y': 4})[0]
+
+    unpickled = pickle.loads(pickle.dumps(cn))
+
+    assert unpickled == cn
+    assert hash(unpickled) == hash(cn)
+    assert repr(unpickled) == repr(cn)
+
+
+def test_callnode_hash_of_shared_nested_calls():
+    # Every call takes the previous call twice, hashing the outermost call
+    # must not hash the innermost 2**depth times
+    depth = 64
+    node = CallNode('f', 'hash', 0)
+    for i in range(depth):
+        node = CallNode('f', 'hash', node, node)
+
+    assert hash(node) == hash(node._replace())
+    assert hash(node[0]) != hash(node)
+
+
+def test_detect_dependencies_explores_shared_calls_once():
+    # A chain of diamonds, every call is referenced by two other calls. A
+    # search that revisits shared calls would need 2**depth steps.
+    depth = 12
+    node = CallNode('f', 'hash', 0)
+    for i in range(depth):
+        left = CallNode('g', 'hash', node)
+        right = CallNode('h', 'hash', node)
+        node = CallNode('f', 'hash', left, right)
+
+    graph = detect_dependencies_by_deepcopy(node)
+
+    assert graph.number_of_nodes() == 3 * depth + 1
+    assert graph.number_of_edges() == 4 * depth
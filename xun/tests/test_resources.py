@@ -25,6 +25,19 @@ def test_override_worker_resources():
     assert g.desc.src == f.desc.src
 
 
+def test_resource_decorators_copy_function():
+    @xun.function()
+    def f():
+        pass
+    g = xun.worker_resource('GPU', 1)(f)
+
+    assert g is not f
+    assert g.dependencies['f'] is g
+    assert f.dependencies['f'] is f
+    assert f.worker_resources == {}
+    assert g.hash == f.hash
+
+
 def test_global_resources():
     @xun.global_resource('zephyre', 2, default_available=1)
     @xun.function()
@@ -132,6 +132,94 @@ def test_store_implementation(cls, contents):
             assert store[key] == value
 
 
+@pytest.mark.parametrize('cls', stores)
+def test_store_many(cls):
+    f_hash = 'xg30cGXs0nKN8gdbzYFWMKidNySbgYZtg5dRV2bj58w='
+    items = [
+        (xun.functions.CallNode('f', f_hash, i), i * 10) for i in range(3)
+    ]
+    with cls() as store:
+        store.store_many(items)
+        for key, value in items:
+            assert key in store
+            assert store[key] == value
+
+
+@pytest.mark.parametrize('cls', stores)
+def test_contains_many(cls):
+    g_hash = 'g7BvXL234Y60a0XYrsJllr5CpQ59ZH81JzYty4138Jg='
+    keys = [xun.functions.CallNode('g', g_hash, i) for i in range(4)]
+    with cls() as store:
+        assert store.contains_many(keys) == set()
+        store.store_many((key, i) for i, key in enumerate(keys[:2]))
+        assert store.contains_many(keys) == set(keys[:2])
+        assert store.guarded().contains_many(keys) == set(keys[:2])
+
+
+class BulkWritingMemory(xun.functions.store.Memory):
+    def __init__(self):
+        super().__init__()
+        self.bulk_writes = []
+
+    def store_many(self, items):
+        items = list(items)
+        self.bulk_writes.append([key for key, _ in items])
+        super().store_many(items)
+
+
+def test_store_many_reaches_backend_through_driver():
+    @xun.function()
+    def f():
+        yield g() is 1
+        return 2
+
+    @f.interface
+    def g():
+        yield from f()
+
+    store = BulkWritingMemory()
+    result = f.blueprint().run(
+        driver=xun.functions.driver.Sequential(),
+        store=store,
+    )
+
+    assert result == 2
+    assert store.bulk_writes == [[g.callnode(), f.callnode()]]
+
+    guarded = store.guarded()
+    guarded.store_many([(f.callnode(), 3)])
+    with pytest.raises(xun.functions.store.store.GuardedStore.StoreError):
+        guarded.store_many([(f.callnode(), 4)])
+
+
+def test_guarded_store_many_checks_references():
+    StoreError = xun.functions.store.store.GuardedStore.StoreError
+    f_hash = 'xg30cGXs0nKN8gdbzYFWMKidNySbgYZtg5dRV2bj58w='
+    a = xun.functions.CallNode('f', f_hash, 0)
+    b = xun.functions.CallNode('f', f_hash, 1)
+
+    store = xun.functions.store.Memory()
+    guarded = store.guarded()
+    guarded.store_many([(a, xun.Reference(b'first'))])
+    with pytest.raises(StoreError):
+        guarded.store_many([(a, xun.Reference(b'second'))])
+    assert store[a].value == b'first'
+
+    # The proxy key of a reference is guarded too
+    guarded.store(b.proxy_callnode, b'proxy')
+    with pytest.raises(StoreError):
+        guarded.store_many([(b, xun.Reference(b'data'))])
+    assert b not in store
+
+    # Nothing in a rejected batch is marked as written
+    c = xun.functions.CallNode('f', f_hash, 2)
+    with pytest.raises(StoreError):
+        guarded.store_many([(c, 1), (a, 2)])
+    assert c not in store
+    guarded.store_many([(c, 3)])
+    assert store[c] == 3
+
+
 @pytest.mark.xfail(reason='Tagged stores not implemented')
 @pytest.mark.parametrize('cls', stores)
 @settings(phases=[Phase.generate, Phase.target, Phase.explain],
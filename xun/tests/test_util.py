@@ -14,6 +14,9 @@ from xun.functions.util import overwrite_scope
 from xun.functions.util import shape_to_ast_tuple
 from xun.functions.util import strip_decorators
 import astunparse
+import importlib
+import os
+import sys
 
 
 global_c = 3
@@ -59,6 +62,41 @@ def test_describe_function():
             decomposed._replace(ast=None))
 
 
+def test_describe_same_definition_different_closures():
+    def make(value):
+        def f():
+            return value
+        return f
+
+    desc_a = describe(make('a'))
+    desc_b = describe(make('b'))
+
+    assert desc_a.src == desc_b.src
+    assert desc_a.globals == {'value': 'a'}
+    assert desc_b.globals == {'value': 'b'}
+
+
+def test_describe_edited_definition(tmp_path, monkeypatch):
+    # Defaults are not part of the code object, so an edited default leaves
+    # the code object of the reloaded function equal to the old one
+    module_path = tmp_path / 'edited_module.py'
+    module_path.write_text('def f(x=1):\n    return x\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'edited_module', raising=False)
+
+    import edited_module
+    before = describe(edited_module.f)
+
+    module_path.write_text('def f(x=2):\n    return x\n')
+    mtime = module_path.stat().st_mtime_ns + 10**9
+    os.utime(module_path, ns=(mtime, mtime))
+    importlib.reload(edited_module)
+    after = describe(edited_module.f)
+
+    assert 'x=1' in before.src
+    assert 'x=2' in after.src
+
+
 def test_argnames():
     def argnames(f):
         fdef = function_ast(f).body[0]